@@ -22,8 +22,8 @@ from builtins import str
 from builtins import range
 from builtins import object
 import argparse
-import contextlib
-import inspect
+import concurrent.futures
+import io
 import locale
 import os.path
 import shutil
@@ -35,6 +35,7 @@ import traceback
 from .. import cli
 from .. import engines
 from .. import errors
+from .. import image_io
 from .. import ipc
 from .. import logger
 from .. import temporary
@@ -55,15 +56,12 @@ logger = logger.setup()
 class Saver(object):
 
     in_place = False
+    # number of command-line arguments the saver option takes:
+    n_args = 0
 
     def __init__(self):
         pass
 
-    @classmethod
-    def get_n_args(cls):
-        init_args, _, _, _ = inspect.getargspec(cls.__init__)
-        return len(init_args) - 1
-
     def check(self):
         pass
 
@@ -76,6 +74,7 @@ class BundledSaver(Saver):
     '''save results as a bundled multi-page document'''
 
     options = '-o', '--save-bundled'
+    n_args = 1
 
     def __init__(self, save_path):
         self._ips = InPlaceSaver()
@@ -97,6 +96,7 @@ class IndirectSaver(Saver):
     '''save results as an indirect multi-page document'''
 
     options = '-i', '--save-indirect'
+    n_args = 1
 
     def __init__(self, save_path):
         self._ips = InPlaceSaver()
@@ -114,6 +114,7 @@ class ScriptSaver(Saver):
     '''save a djvused script with results'''
 
     options = '--save-script',
+    n_args = 1
 
     def __init__(self, save_path):
         self._save_path = os.path.abspath(save_path)
@@ -132,10 +133,13 @@ class InPlaceSaver(Saver):
         ipc.require('djvused')
 
     def save(self, document, pages, djvu_path, sed_file):
-        sed_file_name = os.path.abspath(sed_file.name)
         djvu_path = os.path.abspath(djvu_path)
+        # Feed the script through a pipe instead of making djvused re-open
+        # the file by name.
+        sed_file.seek(0)
         djvused = ipc.Subprocess(
-            ['djvused', '-s', '-f', sed_file_name, djvu_path],
+            ['djvused', '-s', djvu_path],
+            stdin=sed_file,
         )
         djvused.wait()
 
@@ -245,7 +249,7 @@ class ArgumentParser(cli.ArgumentParser):
         saver_group = group.add_mutually_exclusive_group(required=True)
         for saver_type in self.savers:
             options = saver_type.options
-            n_args = saver_type.get_n_args()
+            n_args = saver_type.n_args
             metavar = [None, 'FILE'][n_args]
             saver_group.add_argument(
                 *options,
@@ -288,14 +292,20 @@ class ArgumentParser(cli.ArgumentParser):
 
     class list_engines(argparse.Action):
         def __call__(self, parser, namespace, values, option_string=None):
-            for ename in parser.engines:
-                engine = parser.engines[ename]
+            # Instantiating an engine probes for its executable with a
+            # subprocess; probe all the engines in parallel rather than one
+            # after another.
+            def probe(ename):
                 try:
-                    engine = engine()
+                    parser.engines[ename]()
                 except errors.EngineNotFound:
-                    pass
-                else:
-                    print(ename)
+                    return False
+                return True
+            enames = list(parser.engines)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(enames)) as executor:
+                for ename, found in zip(enames, executor.map(probe, enames)):
+                    if found:
+                        print(ename)
             sys.exit(0)
 
     class list_languages(argparse.Action):
@@ -417,19 +427,26 @@ class Context(djvu.decode.Context):
         if isinstance(message, djvu.decode.ErrorMessage):
             logger.warning(message)
 
-    @contextlib.contextmanager
     def get_output_image(self, nth, page_job):
         output_format = self._image_format
+        if self._engine.accepts_stdin and not self._debug:
+            # The engine can read the image from a pipe; keep it in memory
+            # rather than going through a temporary file.
+            file = io.BytesIO()
+            data = output_format.write_image(page_job, self._options.render_layers, file)
+            file.seek(0)
+            return file, data
         file = self._temp_file('{n:06}.{ext}'.format(
             n=nth,
             ext=output_format.extension
         ),mode='wb',encoding=None)
         try:
-            output_format.write_image(page_job, self._options.render_layers, file)
+            data = output_format.write_image(page_job, self._options.render_layers, file)
             file.flush()
-            yield file
-        finally:
+        except:
             file.close()
+            raise
+        return file, data
 
     def save_raw_ocr(self, page, result):
         output_dir = self._options.save_raw_ocr_dir
@@ -444,16 +461,25 @@ class Context(djvu.decode.Context):
         )
         result.save(prefix)
 
-    def process_page(self, page):
+    def process_page(self, page, next_page=None):
         logger.info('- Page #{0}'.format(page.n + 1))
         page_job = page.decode(wait=True)
+        if next_page is not None:
+            # Let djvulibre decode the next page in the background while this
+            # one is being OCRed.
+            next_page.decode(wait=False)
         # Because of a bug in python-djvulibre <= 0.3.9,
         # sometimes the exception is not raised.
         # Raise in manually in such case.
         if issubclass(page_job.status, djvu.decode.JobFailed):
             raise page_job.status
         size = page_job.size
-        with self.get_output_image(page.n, page_job) as pfile:
+        pfile, data = self.get_output_image(page.n, page_job)
+        with pfile:
+            if self._image_format.bpp == 1 and image_io.is_blank(data):
+                # Don't waste an OCR subprocess on a blank page.
+                logger.info('No text on this page.')
+                return False
             result = self._engine.recognize(pfile, language=self._options.language, details=self._options.details, uax29=self._options.uax29)
             if self._debug:
                 result.save(os.path.join(self._temp_dir, '{n:06}'.format(n=page.n)))
@@ -471,7 +497,7 @@ class Context(djvu.decode.Context):
             return text
 
     def page_thread(self, pages, results, condition):
-        for page in pages:
+        for i, page in enumerate(pages):
             n = page.n
             with condition:
                 result = results[n]
@@ -481,7 +507,8 @@ class Context(djvu.decode.Context):
                 # Mark the page as taken.
                 results[n] = True
             try:
-                result = self.process_page(page)
+                next_page = pages[i + 1] if i + 1 < len(pages) else None
+                result = self.process_page(page, next_page=next_page)
             except djvu.decode.NotAvailable:
                 logger.info('No image suitable for OCR.')
                 result = False
@@ -524,8 +551,14 @@ class Context(djvu.decode.Context):
         else:
             pages = [document.pages[i - 1] for i in pages]
         results = Results()
-        njobs = self._options.n_jobs
-        thread_limit = utils.get_thread_limit(len(pages), njobs)
+        # One thread per page is enough; each page is processed end-to-end by
+        # a single worker, so extra threads would just sit idle.
+        njobs = min(self._options.n_jobs, len(pages))
+        # Give the decoder a head start on the pages the workers will pick up
+        # first, so they don't all begin by waiting on a decode job.
+        for page in pages[:njobs + 1]:
+            page.decode(wait=False)
+        thread_limit = utils.get_thread_limit(len(pages), self._options.n_jobs)
         os.environ['OMP_THREAD_LIMIT'] = str(thread_limit)
         condition = threading.Condition()
         threads = [
@@ -545,17 +578,18 @@ class Context(djvu.decode.Context):
             if self._options.clear_text:
                 sed_file.write('remove-txt\n')
             for page in pages:
+                parts = []
                 try:
                     file_id = page.file.id
                 except UnicodeError:
                     pageno = page.n + 1
                     logger.warning('warning: cannot convert page {n} identifier to locale encoding'.format(n=pageno))
-                    sed_file.write('select {n}\n'.format(n=pageno))
+                    parts += ['select {n}\n'.format(n=pageno)]
                 else:
-                    sed_file.write("select '{fileid}'\n".format(
+                    parts += ["select '{fileid}'\n".format(
                         fileid=file_id.replace('\\', '\\\\').replace("'", "\\'")
-                    ))
-                sed_file.write('set-txt\n')
+                    )]
+                parts += ['set-txt\n']
                 result = None
                 with condition:
                     while True:
@@ -579,9 +613,14 @@ class Context(djvu.decode.Context):
                     # No image suitable for OCR.
                     pass
                 else:
-                    text_zones.print_sexpr(result, sed_file)
+                    buffer = io.StringIO()
+                    text_zones.print_sexpr(result, buffer)
+                    parts += [buffer.getvalue()]
                 result = None  # no longer needed
-                sed_file.write('\n.\n\n')
+                parts += ['\n.\n\n']
+                # One write per page, so that a crash leaves the script at a
+                # page boundary.
+                sed_file.write(''.join(parts))
             sed_file.flush()
             saver = self._options.saver
             if saver.in_place:
@@ -26,6 +26,9 @@ class Engine(object):
     name = None
     image_format = None
     needs_utf8_fix = False
+    # Engines that can read the input image from a pipe don't need the image
+    # to be materialized as a file.
+    accepts_stdin = False
     default_language = 'eng'
 
     def __init__(self, *args, **kwargs):
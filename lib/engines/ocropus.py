@@ -27,6 +27,7 @@ class Engine(common.Engine):
 
     name = 'ocropus'
     image_format = image_io.PNM
+    accepts_stdin = True
 
     executable = utils.property('ocroscript')
     tesseract_executable = utils.property('tesseract')
@@ -34,6 +35,8 @@ class Engine(common.Engine):
     script_name = utils.property()
     has_charboxes = utils.property()
 
+    _cached_script_name = None
+
     def __init__(self, *args, **kwargs):
         common.Engine.__init__(self, **kwargs)
         self.tesseract = tesseract.Engine(executable=self.tesseract_executable)
@@ -41,9 +44,23 @@ class Engine(common.Engine):
         # - if OCRopus is installed and
         # - which version we are dealing with
         if self.script_name is None:
-            script_names = ['recognize', 'rec-tess']
+            # Probing spawns ocroscript; remember the answer, so that
+            # creating another engine instance doesn't probe again.
+            if type(self)._cached_script_name is None:
+                type(self)._cached_script_name = self._probe(['recognize', 'rec-tess'])
+            self.script_name = self._cached_script_name
         else:
-            script_names = [self._script_name]
+            self.script_name = self._probe([self.script_name])
+        if self.has_charboxes is None and self.script_name == 'recognize':
+            # OCRopus ≥ 0.3
+            self.has_charboxes = True
+        # Import hocr late,
+        # so that lxml is imported only when needed.
+        from .. import hocr
+        self._hocr = hocr
+
+    @classmethod
+    def _probe(cls, script_names):
         for script_name in script_names:
             try:
                 ocropus = ipc.Subprocess(['ocroscript', script_name],
@@ -52,7 +69,7 @@ class Engine(common.Engine):
                     stderr=ipc.DEVNULL,
                 )
             except OSError:
-                raise errors.EngineNotFound(self.name)
+                raise errors.EngineNotFound(cls.name)
             try:
                 found = ocropus.stdout.read(7) == 'Usage: '
             finally:
@@ -61,17 +78,8 @@ class Engine(common.Engine):
                 except ipc.CalledProcessError:
                     pass
             if found:
-                self.script_name = script_name
-                break
-        else:
-            raise errors.EngineNotFound(self.name)
-        if self.has_charboxes is None and script_name == 'recognize':
-            # OCRopus ≥ 0.3
-            self.has_charboxes = True
-        # Import hocr late,
-        # so that lxml is imported only when needed.
-        from .. import hocr
-        self._hocr = hocr
+                return script_name
+        raise errors.EngineNotFound(cls.name)
 
     def check_language(self, language):
         return self.tesseract.check_language(language)
@@ -83,6 +91,9 @@ class Engine(common.Engine):
         hocr = self._hocr
         if details is None:
             details = hocr.TEXT_DETAILS_WORD
+        # In-memory images don't have a filesystem name; pipe them through
+        # the standard input instead of going through a temporary file.
+        pipe_image = not hasattr(image, 'name')
         def get_command_line():
             yield self.executable
             assert self.script_name is not None
@@ -91,13 +102,21 @@ class Engine(common.Engine):
                 yield '--charboxes'
             for arg in self.extra_args:
                 yield arg
-            yield image.name
+            if pipe_image:
+                yield '/dev/stdin'
+            else:
+                yield image.name
         ocropus = ipc.Subprocess(list(get_command_line()),
-            stdin=ipc.DEVNULL,
+            stdin=(ipc.PIPE if pipe_image else ipc.DEVNULL),
             stdout=ipc.PIPE,
             env=dict(tesslanguage=language),
         )
         try:
+            if pipe_image:
+                try:
+                    ocropus.stdin.write(image.getvalue())
+                finally:
+                    ocropus.stdin.close()
             return common.Output(
                 ocropus.stdout.read(),
                 format='html',
@@ -44,6 +44,21 @@ _error_pattern = re.compile(
     re.MULTILINE
 )
 
+_boring_stderr_pattern = re.compile('\ATesseract Open Source OCR Engine')
+_broken_html_pattern = re.compile(
+    r'''
+    ( <[!/]?[a-z]+(?:\s+[^<>]*)?>
+    | <!--.*?-->
+    | (?<= // ) <!\[CDATA\[
+    | (?<= //]] ) >
+    | &[a-z]+;
+    | &[#][0-9]+;
+    | &[#]x[0-9a-f]+;
+    | [^<>&]+
+    )
+    ''', re.IGNORECASE | re.VERBOSE | re.DOTALL
+)
+
 _bbox_extras_template = '''\
 <!-- The following script was appended to hOCR by ocrodjvu for internal purposes. -->
 <script type='application/x-ocrodjvu-tesseract'>
@@ -56,7 +71,7 @@ _bbox_extras_template = '''\
 def _filter_boring_stderr(stderr):
     if not stderr:
         return
-    if re.match('\ATesseract Open Source OCR Engine',stderr[0]):
+    if _boring_stderr_pattern.match(stderr[0]):
         del stderr[0]
         # Tesseract prints its own name on standard error
         # even if nothing went wrong
@@ -83,22 +98,9 @@ def fix_html(s):
     Work around buggy hOCR output:
     https://groups.google.com/d/topic/tesseract-issues/AdZhdGFkTrA
     '''
-    regex = re.compile(
-        r'''
-        ( <[!/]?[a-z]+(?:\s+[^<>]*)?>
-        | <!--.*?-->
-        | (?<= // ) <!\[CDATA\[
-        | (?<= //]] ) >
-        | &[a-z]+;
-        | &[#][0-9]+;
-        | &[#]x[0-9a-f]+;
-        | [^<>&]+
-        )
-        ''', re.IGNORECASE | re.VERBOSE | re.DOTALL
-    )
     return ''.join(
         chunk if n & 1 else cgi.escape(chunk)
-        for n, chunk in enumerate(regex.split(s))
+        for n, chunk in enumerate(_broken_html_pattern.split(s))
     )
 
 class ExtractSettings(object):
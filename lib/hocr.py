@@ -21,12 +21,14 @@ http://kba.github.io/hocr-spec/1.2/
 '''
 from __future__ import unicode_literals
 
+from builtins import chr
 from builtins import map
 from builtins import zip
 from builtins import range
 from past.builtins import basestring
 from builtins import object
 import functools
+import io
 import re
 
 from . import utils
@@ -449,6 +451,312 @@ def read_document(stream, settings):
     else:
         return etree.parse(stream, etree.HTMLParser())
 
+class _FastPathMiss(Exception):
+    '''
+    The document doesn't fit the assumptions of the fast path.
+    '''
+
+# OCRopus produces hOCR of a very regular shape (page → paragraph → line →
+# word, with no other markup); for such documents the text can be extracted
+# with a precompiled regex much faster than with a full DOM walk. The regex
+# below tokenizes this shape; anything it cannot account for makes the fast
+# path bail out to the DOM-based one.
+_fast_token_re = re.compile(r'''
+      <div\ class="ocr_page"(?P<page>)(?:\ title="(?P<page_title>[^"]*)")?\ ?/?>
+    | <p\ class="ocr_par"(?P<par>)(?:\ title="(?P<par_title>[^"]*)")?\ ?/?>
+    | <span\ class="ocr_line"(?P<line>)(?:\ title="(?P<line_title>[^"]*)")?\ ?/?>
+    | <span\ class="ocr_word"(?P<word>)(?:\ title="(?P<word_title>[^"]*)")?>(?P<word_text>[^<]*)</span>
+    | (?P<end_span></span>)
+    | (?P<end_par></p>)
+    | (?P<end_page></div>)
+    | (?P<ignored></?h[1-6]>|<br\ ?/?>)
+''', re.VERBOSE)
+
+_fast_entity_re = re.compile(r'&(?:(?P<name>amp|lt|gt|quot)|[#](?:(?P<dec>[0-9]+)|[xX](?P<hex>[0-9A-Fa-f]+)));')
+_fast_unknown_amp_re = re.compile(r'&(?!(?:amp|lt|gt|quot|[#][0-9]+|[#][xX][0-9A-Fa-f]+);)')
+_fast_entity_map = dict(amp='&', lt='<', gt='>', quot='"')
+
+def _fast_unescape_replace(m):
+    name = m.group('name')
+    if name is not None:
+        return _fast_entity_map[name]
+    dec = m.group('dec')
+    if dec is not None:
+        code = int(dec, 10)
+    else:
+        code = int(m.group('hex'), 16)
+    if code > 0x10FFFF or 0xD800 <= code < 0xE000:
+        # Out-of-range or surrogate character reference; let the DOM-based
+        # path deal with it.
+        raise _FastPathMiss
+    return chr(code)
+
+def _fast_unescape(text):
+    if '&' not in text:
+        return text
+    if _fast_unknown_amp_re.search(text):
+        raise _FastPathMiss
+    return _fast_entity_re.sub(_fast_unescape_replace, text)
+
+def _fast_bbox(title):
+    if title is None:
+        return text_zones.BBox()
+    m = bbox_re.search(title)
+    if m is None:
+        return text_zones.BBox()
+    return text_zones.BBox(
+        *(int(m.group(ident))
+        for ident in ('x0', 'y0', 'x1', 'y1'))
+    )
+
+class _FastFrame(object):
+
+    def __init__(self, kind, title=None):
+        self.kind = kind
+        self.title = title
+        self.children = []
+        self.n_elements = 0
+
+def _fast_word(title, text, settings, page_size):
+    if not text:
+        # An empty element has no children; the DOM-based path drops it.
+        return []
+    bbox = _fast_bbox(title)
+    if not bbox:
+        raise _FastPathMiss
+    children = _apply_bboxes(const.TEXT_ZONE_WORD, title or '', text, settings, page_size)
+    if len(children) == 1 and isinstance(children[0], basestring):
+        # Like the DOM-based path, return TEXT_ZONE_CHARACTER even if it was
+        # a word according to hOCR. Words need to be regrouped anyway.
+        return [text_zones.Zone(type=const.TEXT_ZONE_CHARACTER, bbox=bbox, children=children)]
+    return children
+
+def _fast_line(frame, settings, page_size):
+    children = frame.children
+    if len(children) == 0:
+        return []
+    bbox = _fast_bbox(frame.title)
+    has_zone = any(
+        not isinstance(child, basestring)
+        for child in children
+    )
+    if has_zone:
+        for child in children:
+            if isinstance(child, basestring):
+                if child and not child.isspace():
+                    raise _FastPathMiss
+            else:
+                bbox.update(child.bbox)
+        if isinstance(children[-1], basestring) and children[-1].isspace():
+            del children[-1]
+        break_iterator = functools.partial(unicode_support.word_break_iterator, locale=settings.uax29)
+        children = text_zones.group_words(children, settings.details, break_iterator)
+        if len(children) == 0:
+            return []
+    else:
+        text = ''.join(children)
+        children = _apply_bboxes(const.TEXT_ZONE_LINE, frame.title or '', text, settings, page_size)
+        if len(children) == 0:
+            return []
+        if isinstance(children[0], basestring):
+            # Get rid of e.g. trailing newlines.
+            children[0] = children[0].rstrip()
+    if not bbox:
+        if frame.n_elements == 0:
+            # OCRopus 0.2 doesn't always provide necessary bounding box
+            # information; such broken zones are dropped silently, just like
+            # the DOM-based path does.
+            return []
+        raise _FastPathMiss
+    return [text_zones.Zone(type=const.TEXT_ZONE_LINE, bbox=bbox, children=children)]
+
+def _fast_par(frame, settings, page_size):
+    children = frame.children
+    if len(children) == 0:
+        return []
+    bbox = _fast_bbox(frame.title)
+    has_zone = any(
+        not isinstance(child, basestring)
+        for child in children
+    )
+    if has_zone:
+        for child in children:
+            if isinstance(child, basestring):
+                if child and not child.isspace():
+                    raise _FastPathMiss
+            elif child.type == const.TEXT_ZONE_CHARACTER:
+                raise _FastPathMiss
+            else:
+                bbox.update(child.bbox)
+        if isinstance(children[-1], basestring) and children[-1].isspace():
+            del children[-1]
+        children = [child for child in children if not isinstance(child, basestring)]
+        if len(children) == 0:
+            return []
+        if not bbox:
+            raise _FastPathMiss
+    else:
+        text = ''.join(children)
+        children = _apply_bboxes(const.TEXT_ZONE_PARAGRAPH, frame.title or '', text, settings, page_size)
+        if len(children) == 0:
+            return []
+        if isinstance(children[0], basestring):
+            children[0] = children[0].rstrip()
+        if not bbox:
+            if frame.n_elements == 0:
+                return []
+            raise _FastPathMiss
+    return [text_zones.Zone(type=const.TEXT_ZONE_PARAGRAPH, bbox=bbox, children=children)]
+
+def _fast_page(frame, bbox, settings):
+    children = frame.children
+    if len(children) == 0:
+        return [text_zones.Zone(type=const.TEXT_ZONE_PAGE, bbox=bbox)]
+    for child in children:
+        if isinstance(child, basestring):
+            if child and not child.isspace():
+                raise _FastPathMiss
+        elif child.type == const.TEXT_ZONE_CHARACTER:
+            raise _FastPathMiss
+    if isinstance(children[-1], basestring) and children[-1].isspace():
+        del children[-1]
+    children = [child for child in children if not isinstance(child, basestring)]
+    if len(children) == 0:
+        return [text_zones.Zone(type=const.TEXT_ZONE_PAGE, bbox=bbox)]
+    return [text_zones.Zone(type=const.TEXT_ZONE_PAGE, bbox=bbox, children=children)]
+
+def _fast_path_applicable(settings):
+    return (
+        settings.details >= TEXT_DETAILS_WORD and
+        settings.uax29 is None and
+        not settings.html5 and
+        not settings.fix_utf8
+    )
+
+def _extract_text_fast(contents, settings):
+    if 'ocr-capabilities' not in contents or 'ocr-system' in contents:
+        # Without the hOCR meta information the DOM-based path applies
+        # engine-specific work-arounds; don't try to mimic them here.
+        # This is only a crude whole-document substring check; a document
+        # whose body happens to contain these strings as text gets past it,
+        # but any markup the tokenizer below doesn't recognize (such as the
+        # meta elements proper, were they misplaced into the body) still
+        # makes the fast path bail out.
+        raise _FastPathMiss
+    body_start = contents.find('<body')
+    if body_start < 0:
+        raise _FastPathMiss
+    body_start = contents.find('>', body_start)
+    if body_start < 0:
+        raise _FastPathMiss
+    body_end = contents.find('</body>', body_start)
+    if body_end < 0:
+        raise _FastPathMiss
+    body = contents[body_start + 1:body_end]
+    result = []
+    stack = []
+    page_bbox = page_size = None
+    pos = 0
+    for token in _fast_token_re.finditer(body):
+        gap = body[pos:token.start()]
+        pos = token.end()
+        if gap:
+            if '<' in gap:
+                # Markup the tokenizer doesn't recognize; in well-formed hOCR
+                # a literal “<” would have been escaped as an entity.
+                raise _FastPathMiss
+            if stack:
+                stack[-1].children += [_fast_unescape(gap)]
+            elif not gap.isspace():
+                raise _FastPathMiss
+        if token.group('end_span') is not None:
+            if not stack or stack[-1].kind != 'line':
+                raise _FastPathMiss
+            frame = stack.pop()
+            stack[-1].children += _fast_line(frame, settings, page_size)
+        elif token.group('end_par') is not None:
+            # A stray </p> is ignored, like HTML parsers do.
+            if stack and stack[-1].kind == 'par':
+                frame = stack.pop()
+                stack[-1].children += _fast_par(frame, settings, page_size)
+            elif stack and stack[-1].kind == 'line':
+                raise _FastPathMiss
+        elif token.group('end_page') is not None:
+            if stack and stack[-1].kind == 'par':
+                # HTML parsers close an open <p> implicitly here.
+                frame = stack.pop()
+                stack[-1].children += _fast_par(frame, settings, page_size)
+            if len(stack) != 1 or stack[-1].kind != 'page':
+                raise _FastPathMiss
+            frame = stack.pop()
+            result += _fast_page(frame, page_bbox, settings)
+            page_bbox = page_size = None
+        elif token.group('word') is not None:
+            if not stack or stack[-1].kind != 'line':
+                raise _FastPathMiss
+            stack[-1].n_elements += 1
+            text = _fast_unescape(token.group('word_text'))
+            stack[-1].children += _fast_word(token.group('word_title'), text, settings, page_size)
+        elif token.group('line') is not None:
+            if not stack or stack[-1].kind not in ('page', 'par'):
+                raise _FastPathMiss
+            stack[-1].n_elements += 1
+            stack += [_FastFrame('line', token.group('line_title'))]
+        elif token.group('par') is not None:
+            if stack and stack[-1].kind == 'par':
+                # <p> cannot nest; HTML parsers close the open one first.
+                frame = stack.pop()
+                stack[-1].children += _fast_par(frame, settings, page_size)
+            if not stack or stack[-1].kind != 'page':
+                raise _FastPathMiss
+            stack[-1].n_elements += 1
+            stack += [_FastFrame('par', token.group('par_title'))]
+        elif token.group('page') is not None:
+            if stack:
+                raise _FastPathMiss
+            bbox = _fast_bbox(token.group('page_title'))
+            if not bbox:
+                if settings.page_size is None:
+                    raise _FastPathMiss
+                page_width, page_height = page_size = settings.page_size
+                bbox = text_zones.BBox(0, 0, page_width, page_height)
+            else:
+                if (bbox.x0, bbox.y0) != (0, 0):
+                    raise _FastPathMiss
+                page_size = bbox.x1, bbox.y1
+            page_bbox = bbox
+            stack += [_FastFrame('page', token.group('page_title'))]
+        else:
+            assert token.group('ignored') is not None
+            ignored = token.group('ignored')
+            if ignored.startswith('</'):
+                continue
+            if ignored.startswith('<h'):
+                if stack and stack[-1].kind == 'par':
+                    # Headings are block elements; HTML parsers close an open
+                    # <p> implicitly when one starts.
+                    frame = stack.pop()
+                    stack[-1].children += _fast_par(frame, settings, page_size)
+                elif stack and stack[-1].kind == 'line':
+                    raise _FastPathMiss
+            if stack:
+                stack[-1].n_elements += 1
+    tail = body[pos:]
+    if tail and not tail.isspace():
+        raise _FastPathMiss
+    # HTML parsers close any still-open elements at the end of the document.
+    if stack and stack[-1].kind == 'par':
+        frame = stack.pop()
+        stack[-1].children += _fast_par(frame, settings, page_size)
+    if len(stack) == 1 and stack[-1].kind == 'page':
+        frame = stack.pop()
+        result += _fast_page(frame, page_bbox, settings)
+    if stack or not result:
+        raise _FastPathMiss
+    for zone in result:
+        zone.rotate(settings.rotation)
+    return [zone.sexpr for zone in result]
+
 def extract_text(stream, **kwargs):
     '''
     Extract DjVu text from an hOCR stream.
@@ -457,6 +765,16 @@ def extract_text(stream, **kwargs):
     uax29: None or a PyICU locale
     '''
     settings = ExtractSettings(**kwargs)
+    if _fast_path_applicable(settings):
+        contents = stream.read()
+        if isinstance(contents, bytes):
+            stream = io.BytesIO(contents)
+        else:
+            try:
+                return _extract_text_fast(contents, settings)
+            except _FastPathMiss:
+                pass
+            stream = io.StringIO(contents)
     doc = read_document(stream, settings)
     ocr_system = doc.find('/head/meta[@name="ocr-system"]')
     if ocr_system is None:
@@ -25,6 +25,21 @@ except ImportError as ex:
     utils.enhance_import_error(ex, 'python-djvulibre', 'python-djvu', 'http://jwilk.net/software/python-djvulibre')
     raise
 
+try:
+    import numpy
+except ImportError:  # no coverage
+    # numpy is optional; it only makes blank-page detection faster.
+    numpy = None
+
+def is_blank(data):
+    '''
+    Check whether raw bilevel image data consists of white pixels only.
+    '''
+    # All the bilevel pixel formats below use 0 for white.
+    if numpy is not None:
+        return not numpy.frombuffer(data, dtype=numpy.uint8).any()
+    return data.count(0) == len(data)
+
 class ImageFormat(object):
 
     extension = None
@@ -74,15 +89,16 @@ class PNM(ImageFormat):
         size = page_job.size
         rect = (0, 0) + size
         if self._pixel_format.bpp == 1:
-            file.write('P4 {0} {1}\n'.format(*size).encode('ASCII'))  # PBM header
+            header = 'P4 {0} {1}\n'.format(*size).encode('ASCII')  # PBM header
         else:
-            file.write('P6 {0} {1} 255\n'.format(*size).encode('ASCII'))  # PPM header
+            header = 'P6 {0} {1} 255\n'.format(*size).encode('ASCII')  # PPM header
         data = page_job.render(
             render_layers,
             rect, rect,
             self._pixel_format
         )
-        file.write(data)
+        file.writelines((header, data))
+        return data
 
 class BMP(ImageFormat):
 
@@ -112,13 +128,14 @@ class BMP(ImageFormat):
         )
         n_palette_colors = 2 * (self._pixel_format.bpp == 1)
         headers_size = 54 + 4 * n_palette_colors
-        file.write(struct.pack('<ccIHHI',
+        header = []
+        header += struct.pack('<ccIHHI',
             b'B', b'M',  # magic
             len(data) + headers_size,  # whole file size
             0, 0,  # identification magic
             headers_size  # offset to pixel data
-        ))
-        file.write(struct.pack('<IIIHHIIIIII',
+        ),
+        header += struct.pack('<IIIHHIIIIII',
             40,  # size of this header
             size[0], size[1],  # image size in pixels
             1,  # number of color planes
@@ -128,12 +145,13 @@ class BMP(ImageFormat):
             dpm, dpm,  # resolution in pixels/meter
             n_palette_colors,  # number of colors in the color palette
             n_palette_colors  # number of important colors
-        ))
+        ),
         if self._pixel_format.bpp == 1:
             # palette:
-            file.write(struct.pack('<BBBB', 0xFF, 0xFF, 0xFF, 0))
-            file.write(struct.pack('<BBBB', 0, 0, 0, 0))
-        file.write(data)
+            header += struct.pack('<BBBB', 0xFF, 0xFF, 0xFF, 0),
+            header += struct.pack('<BBBB', 0, 0, 0, 0),
+        file.writelines(header + [data])
+        return data
 
 class TIFF(ImageFormat):
 
@@ -186,7 +204,7 @@ class TIFF(ImageFormat):
         assert len(header) == n_tags + 5
         header = b''.join(header)
         assert len(header) == data_offset
-        file.write(header)
-        file.write(data)
+        file.writelines((header, data))
+        return data
 
 # vim:ts=4 sts=4 sw=4 et
@@ -102,12 +102,14 @@ class Subprocess(subprocess.Popen):
         if lc_ctype:
             env['LC_CTYPE'] = lc_ctype
         if override:
-            env.update(env)
+            env.update(override)
         return env
 
     def __init__(self, *args, **kwargs):
         kwargs['env'] = self.override_env(kwargs.get('env'))
-        if os.name == 'posix':
+        if os.name == 'posix' and sys.version_info < (3,):
+            # close_fds=True is already the default on Python 3;
+            # only Python 2 needs it spelled out.
             kwargs.update(close_fds=True)
         try:
             commandline = kwargs['args']
@@ -151,6 +151,16 @@ class Zone(object):
             chld=self.children,
         )
 
+    def _mirror_y(self, page_height):
+        for x in self.bbox:
+            assert x is not None
+        x0, y0, x1, y1 = self.bbox
+        y0, y1 = page_height - y1, page_height - y0
+        self.bbox = x0, y0, x1, y1
+        for child in self:
+            if isinstance(child, Zone):
+                child._mirror_y(page_height)
+
     def rotate(self, rotation, xform=None):
         for x in self.bbox:
             assert x is not None
@@ -162,6 +172,11 @@ class Zone(object):
                 'top-left page corner is ({0}, {1}) rather than (0, 0)'.format(*self.bbox[:2])
             )
             page_size = self.bbox[2:]
+            if rotation == 0:
+                # For unrotated pages the transform boils down to flipping the
+                # y-axis; do that directly instead of mapping every corner
+                # through an affine transform.
+                return self._mirror_y(page_size[1])
             if (rotation // 90) & 1:
                 xform = decode.AffineTransform((0, 0) + tuple(reversed(page_size)), (0, 0) + page_size)
             else:
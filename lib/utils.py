@@ -45,17 +45,20 @@ def parse_page_numbers(pages):
     parse_page_numbers('17,37-42') -> [17, 37, 38, ..., 42]
     parse_page_numbers('42-37') -> []
     parse_page_numbers('17-17') -> [17]
+    parse_page_numbers('6-8,4-7') -> [4, 5, 6, 7, 8]
+
+    The result is sorted and has no duplicates.
     '''
     if pages is None:
         return
-    result = []
+    result = set()
     for page_range in pages.split(','):
         if '-' in page_range:
             x, y = list(map(int, page_range.split('-', 1)))
-            result += range(x, y + 1)
+            result.update(range(x, y + 1))
         else:
-            result += [int(page_range, 10)]
-    return result
+            result.add(int(page_range, 10))
+    return sorted(result)
 
 _special_chars_replace = re.compile(r'''[\x00-\x1F'"\x5C\x7F-\x9F]''').sub
 
@@ -0,0 +1,62 @@
+# encoding=UTF-8
+
+# Copyright © 2019 Jakub Wilk <jwilk@jwilk.net>
+#
+# This file is part of ocrodjvu.
+#
+# ocrodjvu is free software; you can redistribute it and/or modify it
+# under the terms of the GNU General Public License version 2 as
+# published by the Free Software Foundation.
+#
+# ocrodjvu is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License
+# for more details.
+
+from __future__ import unicode_literals
+import io
+
+from tests.tools import (
+    assert_equal,
+    assert_raises,
+)
+
+from lib import hocr
+from lib import text_zones
+
+_document_template = '''\
+<html><head><meta content="ocr_line ocr_page" name="ocr-capabilities"/></head>
+<body><div class="ocr_page" title="bbox 0 0 1000 800">
+<span class="ocr_line" title="bbox 10 10 200 30">{line}</span>
+</div></body></html>
+'''
+
+class test_fast_path(object):
+
+    def extract(self, line):
+        contents = _document_template.format(line=line)
+        settings = hocr.ExtractSettings(rotation=0, details=hocr.TEXT_DETAILS_LINE, page_size=None)
+        return hocr._extract_text_fast(contents, settings)
+
+    def test_plain_line(self):
+        [page] = self.extract('hello world')
+        fp = io.StringIO()
+        text_zones.print_sexpr(page, fp)
+        assert_equal(fp.getvalue(),
+            '(page 0 0 1000 800 (line 10 770 200 790 "hello world"))'
+        )
+
+    def test_bad_character_reference(self):
+        # Out-of-range and surrogate character references must make the fast
+        # path bail out rather than crash or emit a lone surrogate.
+        for line in ('&#1114112;', '&#x110000;', '&#xD800;'):
+            with assert_raises(hocr._FastPathMiss):
+                self.extract(line)
+
+    def test_unknown_markup(self):
+        # Markup the tokenizer doesn't recognize must make the fast path bail
+        # out rather than leak into the extracted text.
+        with assert_raises(hocr._FastPathMiss):
+            self.extract('hello <em>bold</em> world')
+
+# vim:ts=4 sts=4 sw=4 et
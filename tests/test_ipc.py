@@ -131,7 +131,7 @@ class test_environment(object):
                 env=dict(ocrodjvu='24'),
             )
             stdout, stderr = child.communicate()
-            assert_equal(stdout, b'42')
+            assert_equal(stdout, b'24')
             assert_equal(stderr, b'')
 
     def test_path(self):
@@ -145,6 +145,12 @@ class test_parse_page_numbers(object):
     def test_collapsed_range(self):
         assert_equal(parse_page_numbers('17-17'), [17])
 
+    def test_overlapping_ranges(self):
+        assert_equal(parse_page_numbers('6-8,4-7'), [4, 5, 6, 7, 8])
+
+    def test_duplicates(self):
+        assert_equal(parse_page_numbers('17,17'), [17])
+
 class test_sanitize_utf8(object):
 
     def test_control_characters(self):